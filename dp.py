@@ -12,8 +12,16 @@ Interactive mode: prompts for number of clauses, then each clause as integer lit
 
 Benchmark mode: divides files into 10 equal blocks, samples N files per block (default N=10 for 100 total),
 runs DP in parallel, and prints per-file times plus summary.
+Memory is reported as growth of the process peak RSS; pass --memprofile to trace
+Python allocations with tracemalloc instead (slower, and the numbers differ).
+
+Solving: DP variable elimination runs as a preprocessing pass, bounded so that no
+elimination adds more resolvents than it removes clauses. The residual formula is
+decided by an iterative decide/propagate/backtrack loop over two watched literals
+per clause, so propagation only visits clauses watching the falsified literal.
 """
 import os
+import re
 import sys
 import glob
 import random
@@ -21,17 +29,101 @@ import time
 import argparse
 from multiprocessing import Pool, cpu_count
 import tracemalloc
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+from array import array
+from itertools import chain
 
-def parse_dimacs_file(path):
+# tracemalloc slows allocation-heavy solving considerably, so it is only used
+# when asked for; otherwise memory is read from the process peak RSS.
+MEMPROFILE = resource is None
+# Linux lets a process reset its peak RSS (VmHWM), so a reused worker can
+# still measure each solve on its own.
+RSS_RESETTABLE = os.access('/proc/self/clear_refs', os.W_OK)
+
+# Parsed clauses are cached next to each .cnf file and reused while newer.
+CACHE_SUFFIX = '.cache'
+CACHE_MAGIC = 0x43464e43  # b'CNFC'
+CACHE_VERSION = 1
+
+HEADER_RE = re.compile(rb'(?m)^[ \t]*[cp%].*$')
+
+def save_clauses(cache, clauses):
+    # Layout: magic, version, clause count and literal count, then the clause
+    # offsets into the literal array and the literals themselves.
+    offsets = array('i', [0])
+    lits = array('i')
+    for c in clauses:
+        lits.extend(c)
+        offsets.append(len(lits))
+    tmp = f"{cache}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            array('i', [CACHE_MAGIC, CACHE_VERSION, len(clauses), len(lits)]).tofile(f)
+            offsets.tofile(f)
+            lits.tofile(f)
+        os.replace(tmp, cache)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def load_clauses(cache):
+    data = array('i')
+    with open(cache, 'rb') as f:
+        raw = f.read()
+    if len(raw) % data.itemsize:
+        raise ValueError(f"{cache}: not a clause cache")
+    data.frombytes(raw)
+    if len(data) < 4 or data[0] != CACHE_MAGIC or data[1] != CACHE_VERSION:
+        raise ValueError(f"{cache}: not a clause cache")
+    n, nlits = data[2], data[3]
+    if n < 0 or nlits < 0 or len(data) != 4 + n + 1 + nlits:
+        raise ValueError(f"{cache}: clause cache has the wrong size")
+    offsets, lits = data[4:n+5], data[n+5:]
+    if offsets[0] != 0 or offsets[n] != nlits or any(a > b for a, b in zip(offsets, offsets[1:])):
+        raise ValueError(f"{cache}: clause cache has bad offsets")
+    return [lits[offsets[i]:offsets[i+1]].tolist() for i in range(n)]
+
+def cache_is_fresh(path):
+    try:
+        return os.path.getmtime(path + CACHE_SUFFIX) >= os.path.getmtime(path)
+    except OSError:
+        return False
+
+def read_dimacs(path):
+    with open(path, 'rb') as f:
+        tokens = HEADER_RE.sub(b'', f.read()).split()
+    tokens.append(b'0')
     clauses = []
-    with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line or line[0] in ('c','%') or line.startswith('p'):
-                continue
-            lits = [int(x) for x in line.split() if x!='0']
-            if lits:
-                clauses.append(lits)
+    start = 0
+    while start < len(tokens):
+        end = tokens.index(b'0', start)
+        if end > start:
+            clauses.append(list(map(int, tokens[start:end])))
+        start = end + 1
+    return clauses
+
+def parse_dimacs_file(path):
+    # The cache holds the clauses exactly as written in the file, shared by
+    # all three solvers; any solver-specific normalisation happens after it.
+    cache = path + CACHE_SUFFIX
+    clauses = None
+    if cache_is_fresh(path):
+        try:
+            clauses = load_clauses(cache)
+        except ValueError:
+            pass
+    if clauses is None:
+        clauses = read_dimacs(path)
+        try:
+            save_clauses(cache, clauses)
+        except OSError:
+            pass
     return clauses
 
 def parse_dimacs_lines(lines):
@@ -42,71 +134,319 @@ def parse_dimacs_lines(lines):
             clauses.append(lits)
     return clauses
 
-def find_unit_clause(clauses):
-    for c in clauses:
-        if len(c)==1:
-            return c[0]
+def find_pure_literal(pos_count, neg_count):
+    for v in range(1, len(pos_count)):
+        if pos_count[v] and not neg_count[v]:
+            return v
+        if neg_count[v] and not pos_count[v]:
+            return -v
     return None
 
-def unit_propagate(clauses, unit):
-    new = []
-    for c in clauses:
-        if unit in c:
-            continue
-        if -unit in c:
-            r = [lit for lit in c if lit!=-unit]
+def elimination_variable(pos_count, neg_count):
+    # Without pure literals every variable occurs in both polarities; pick the
+    # one whose elimination adds the fewest clauses in the worst case.
+    return min((v for v in range(1, len(pos_count)) if pos_count[v]),
+               key=lambda v: pos_count[v]*neg_count[v] - pos_count[v] - neg_count[v])
+
+def resolvents_on(pos, neg, var):
+    pos = [[l for l in C if l!=var] for C in pos]
+    neg = [[l for l in D if l!=-var] for D in neg]
+    resolvents = []
+    for C in pos:
+        for D in neg:
+            # Dedup and tautology check in one pass over bitmasks of the
+            # positive and negative literals seen so far.
+            seen_pos = seen_neg = 0
+            R = []
+            for l in chain(C, D):
+                if l > 0:
+                    b = 1 << l
+                    if seen_neg & b:
+                        break
+                    if not seen_pos & b:
+                        seen_pos |= b
+                        R.append(l)
+                else:
+                    b = 1 << -l
+                    if seen_pos & b:
+                        break
+                    if not seen_neg & b:
+                        seen_neg |= b
+                        R.append(l)
+            else:
+                if not R:
+                    return None
+                resolvents.append(R)
+    return resolvents
+
+def clause_mask(c, width):
+    # Bit v stands for literal v and bit width+v for -v.
+    m = 0
+    for l in c:
+        m |= 1 << (l if l > 0 else width - l)
+    return m
+
+def subsumes(a, b):
+    return not a & ~b
+
+class ClauseSet:
+    # The live clauses of the elimination pass by id, with their masks, an
+    # occurrence index and per-polarity counts, all updated as clauses are
+    # added and removed so a step only touches the clauses it changes.
+    def __init__(self, clauses, nvars):
+        self.width = nvars + 1
+        self.clauses = {}
+        self.masks = {}
+        self.occ = {}
+        self.pos_count = array('i', [0]) * (nvars+1)
+        self.neg_count = array('i', [0]) * (nvars+1)
+        self.units = []
+        self.next_id = 0
+        for c in clauses:
+            self.add(c)
+
+    def add(self, c, m=None):
+        i = self.next_id
+        self.next_id += 1
+        self.clauses[i] = c
+        self.masks[i] = clause_mask(c, self.width) if m is None else m
+        for l in c:
+            self.occ.setdefault(l, set()).add(i)
+            if l > 0:
+                self.pos_count[l] += 1
+            else:
+                self.neg_count[-l] += 1
+        if len(c)==1:
+            self.units.append(i)
+
+    def remove(self, i):
+        c = self.clauses.pop(i)
+        del self.masks[i]
+        for l in c:
+            self.occ[l].discard(i)
+            if l > 0:
+                self.pos_count[l] -= 1
+            else:
+                self.neg_count[-l] -= 1
+
+    def containing(self, lit):
+        return sorted(self.occ.get(lit, ()))
+
+    def find_unit(self):
+        while self.units:
+            i = self.units.pop()
+            if i in self.clauses:
+                return self.clauses[i][0]
+        return None
+
+    def propagate_unit(self, unit):
+        for i in self.containing(unit):
+            self.remove(i)
+        for i in self.containing(-unit):
+            r = [l for l in self.clauses[i] if l!=-unit]
             if not r:
-                return [[]]
-            new.append(r)
-        else:
-            new.append(c)
-    return new
+                return False
+            self.remove(i)
+            self.add(r)
+        return True
 
-def find_pure_literal(clauses):
-    pol = {}
-    for c in clauses:
-        for lit in c:
-            v = abs(lit)
-            pol.setdefault(v, set()).add(lit>0)
-    for v, signs in pol.items():
-        if len(signs)==1:
-            return v if True in signs else -v
-    return None
+    def add_resolvents(self, resolvents):
+        masks, occ = self.masks, self.occ
+        for R in sorted(resolvents, key=len):
+            m = clause_mask(R, self.width)
+            if any(subsumes(masks[i], m) for l in R for i in occ.get(l, ())):
+                continue
+            rare = min(R, key=lambda l: len(occ.get(l, ())))
+            for i in [i for i in occ.get(rare, ()) if subsumes(m, masks[i])]:
+                self.remove(i)
+            self.add(R, m)
 
 def dp_eliminate(clauses):
-    if any(len(c)==0 for c in clauses):
+    # DP elimination is only run as preprocessing: a variable is eliminated
+    # while its resolvents do not outnumber the clauses they replace, and the
+    # residual formula is handed to the watched-literal Solver.
+    nvars = max((abs(l) for c in clauses for l in c), default=0)
+    db = ClauseSet(clauses, nvars)
+    while True:
+        if not db.clauses:
+            return True
+        p = find_pure_literal(db.pos_count, db.neg_count)
+        if p is not None:
+            for i in db.containing(p):
+                db.remove(i)
+            continue
+        u = db.find_unit()
+        if u is not None:
+            if not db.propagate_unit(u):
+                return False
+            continue
+        var = elimination_variable(db.pos_count, db.neg_count)
+        pos_ids, neg_ids = db.containing(var), db.containing(-var)
+        pos = [db.clauses[i] for i in pos_ids]
+        neg = [db.clauses[i] for i in neg_ids]
+        resolvents = resolvents_on(pos, neg, var)
+        if resolvents is None:
+            return False
+        if len(resolvents) > len(pos) + len(neg):
+            return list(db.clauses.values())
+        for i in set(pos_ids).union(neg_ids):
+            db.remove(i)
+        db.add_resolvents(resolvents)
+
+def lit_code(lit):
+    return 2*lit if lit>0 else 1-2*lit
+
+class Solver:
+    def __init__(self, clauses):
+        nvars = max((abs(l) for c in clauses for l in c), default=0)
+        self.assigns = array('b', bytes(nvars+1))
+        self.watches = [[] for _ in range(2*nvars+2)]
+        self.trail = []
+        self.decisions = []
+        self.clauses = []
+        self.qhead = 0
+        self.next_var = 0
+        self.ok = True
+        for c in clauses:
+            self.add_clause(c)
+        # Branch only on variables left in some clause: elimination leaves
+        # gaps in the numbering, and chronological backtracking would
+        # re-search the whole subtree below a decision on an absent variable.
+        self.vars = sorted({abs(l) for c in self.clauses for l in c})
+
+    def value(self, lit):
+        v = self.assigns[abs(lit)]
+        return v if lit>0 else -v
+
+    def assign(self, lit):
+        self.assigns[abs(lit)] = 1 if lit>0 else -1
+        self.trail.append(lit)
+
+    def add_clause(self, lits):
+        lits = list(dict.fromkeys(lits))
+        if any(-l in lits for l in lits):
+            return
+        if not lits:
+            self.ok = False
+        elif len(lits)==1:
+            val = self.value(lits[0])
+            if val==-1:
+                self.ok = False
+            elif val==0:
+                self.assign(lits[0])
+        else:
+            ci = len(self.clauses)
+            self.clauses.append(array('i', lits))
+            self.watches[lit_code(lits[0])].append(ci)
+            self.watches[lit_code(lits[1])].append(ci)
+
+    def propagate(self):
+        trail, clauses, watches = self.trail, self.clauses, self.watches
+        while self.qhead < len(trail):
+            false_lit = -trail[self.qhead]
+            self.qhead += 1
+            ws = watches[lit_code(false_lit)]
+            kept = []
+            i = 0
+            while i < len(ws):
+                ci = ws[i]
+                i += 1
+                c = clauses[ci]
+                if c[0]==false_lit:
+                    c[0], c[1] = c[1], false_lit
+                if self.value(c[0])==1:
+                    kept.append(ci)
+                    continue
+                for k in range(2, len(c)):
+                    if self.value(c[k])!=-1:
+                        c[1], c[k] = c[k], false_lit
+                        watches[lit_code(c[1])].append(ci)
+                        break
+                else:
+                    kept.append(ci)
+                    if self.value(c[0])==-1:
+                        kept.extend(ws[i:])
+                        watches[lit_code(false_lit)] = kept
+                        return False
+                    self.assign(c[0])
+            watches[lit_code(false_lit)] = kept
+        return True
+
+    def backtrack(self):
+        while self.decisions:
+            pos, lit, flipped = self.decisions.pop()
+            for l in self.trail[pos:]:
+                self.assigns[abs(l)] = 0
+            del self.trail[pos:]
+            self.qhead = pos
+            self.next_var = 0
+            if not flipped:
+                self.decisions.append((pos, -lit, True))
+                self.assign(-lit)
+                return True
         return False
-    if not clauses:
+
+    def decide(self):
+        assigns, order = self.assigns, self.vars
+        i = self.next_var
+        while i < len(order) and assigns[order[i]]!=0:
+            i += 1
+        self.next_var = i
+        if i==len(order):
+            return False
+        v = order[i]
+        self.decisions.append((len(self.trail), v, False))
+        self.assign(v)
         return True
-    p = find_pure_literal(clauses)
-    if p is not None:
-        return dp_eliminate([c for c in clauses if p not in c])
-    u = find_unit_clause(clauses)
-    if u is not None:
-        return dp_eliminate(unit_propagate(clauses, u))
-    lit0 = clauses[0][0]
-    var = abs(lit0)
-    pos = [c for c in clauses if var in c]
-    neg = [c for c in clauses if -var in c]
-    rest = [c for c in clauses if var not in c and -var not in c]
-    resolvents = []
-    for C in pos:
-        for D in neg:
-            R = [l for l in C if l!=var] + [l for l in D if l!=-var]
-            R = list(dict.fromkeys(R))
-            if not any(-l in R for l in R):
-                resolvents.append(R)
-    return dp_eliminate(rest + resolvents)
 
-def run_with_metrics(clauses):
+    def solve(self):
+        if not self.ok:
+            return False
+        while True:
+            if not self.propagate():
+                if not self.backtrack():
+                    return False
+            elif not self.decide():
+                return True
 
-    tracemalloc.start()
+def dp_solve(clauses):
+    reduced = dp_eliminate(clauses)
+    if reduced is True or reduced is False:
+        return reduced
+    return Solver(reduced).solve()
+
+def peak_rss():
+    if RSS_RESETTABLE:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+def start_metrics():
+    if MEMPROFILE:
+        tracemalloc.start()
+        return 0
+    if RSS_RESETTABLE:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    return peak_rss()
+
+def stop_metrics(rss_before):
+    if MEMPROFILE:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak / (1024*1024)
+    return (peak_rss() - rss_before) / (1024*1024)
+
+def run_with_metrics(clauses):
+    rss_before = start_metrics()
     start = time.time()
-    result = dp_eliminate(clauses)
+    result = dp_solve(clauses)
     elapsed = time.time() - start
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    peak_mib = peak / (1024 * 1024)
+    peak_mib = stop_metrics(rss_before)
     return result, elapsed, peak_mib
 
 
@@ -128,6 +468,13 @@ def worker_dp(path):
     print(f"{name}: {'SAT' if sat else 'UNSAT'} in {elapsed:.3f}s, {peak_mem:.2f}MiB", flush=True)
     return elapsed, sat, peak_mem, name
 
+def init_worker(memprofile):
+    global MEMPROFILE
+    MEMPROFILE = memprofile
+    if not memprofile and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    random.seed()
+
 def benchmark_mode(folder, sample_per_block, workers):
     files = sorted(glob.glob(os.path.join(folder, "*.cnf")))
     if not files:
@@ -140,11 +487,23 @@ def benchmark_mode(folder, sample_per_block, workers):
         blk = files[i*block_size:(i+1)*block_size] if i<9 else files[i*block_size:]
         picks = blk if len(blk)<=sample_per_block else random.sample(blk, sample_per_block)
         samples.extend(picks)
+    # Parse the DIMACS text once in the parent; workers then only load the
+    # packed clause cache.
+    for path in samples:
+        if not cache_is_fresh(path):
+            parse_dimacs_file(path)
     print(f"Sampling {len(samples)} out of {total} files with {workers or cpu_count()} workers...\n")
     results = []
-    pool = Pool(processes=workers or cpu_count())
+    nproc = workers or cpu_count()
+    # Workers are reused and fed batches unless RSS figures need a fresh
+    # process per file because the peak cannot be reset between solves.
+    reuse = MEMPROFILE or RSS_RESETTABLE
+    maxtasks = None if reuse else 1
+    chunksize = max(1, len(samples) // (nproc*4)) if reuse else 1
+    pool = Pool(processes=nproc, initializer=init_worker, initargs=(MEMPROFILE,),
+                maxtasksperchild=maxtasks)
     try:
-        for res in pool.imap_unordered(worker_dp, samples):
+        for res in pool.imap_unordered(worker_dp, samples, chunksize=chunksize):
             results.append(res)
     except KeyboardInterrupt:
         print("\nReceived interrupt — terminating workers…", file=sys.stderr)
@@ -176,13 +535,22 @@ def benchmark_mode(folder, sample_per_block, workers):
     print(f"Slowest solve time     : {max(times):.3f}s ({results[slowest_idx][3]})")
     print(f"Lowest memory usage    : {min(mems):.2f} MiB ({results[leanest_idx][3]})")
     print(f"Highest memory usage   : {max(mems):.2f} MiB ({results[heaviest_idx][3]})")
+    if MEMPROFILE:
+        print("Memory figures are tracemalloc peaks of Python allocations.")
+    else:
+        print("Memory figures are peak RSS growth during each solve"
+              + ("" if RSS_RESETTABLE else ", one worker process per file")
+              + " (use --memprofile for tracemalloc).")
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('cnf_dir', nargs='?')
     parser.add_argument('--sample-per-block', type=int, default=10)
     parser.add_argument('--workers', type=int, default=0)
+    parser.add_argument('--memprofile', action='store_true')
     args = parser.parse_args()
+    global MEMPROFILE
+    MEMPROFILE = MEMPROFILE or args.memprofile
     random.seed()
     if args.cnf_dir and os.path.isdir(args.cnf_dir):
         benchmark_mode(args.cnf_dir, args.sample_per_block, args.workers)
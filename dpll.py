@@ -8,30 +8,138 @@ Usage:
   # Benchmark DPLL on a folder of DIMACS .cnf files
   $ python dpllsolver.py /path/to/cnf_directory --sample-per-block 10 --workers 4
 
+  # Benchmark DPLL one file at a time, splitting each search over 4 processes
+  $ python dpllsolver.py /path/to/cnf_directory --branch-workers 4
+
 Interactive mode: prompts for number of clauses, then each clause as integer literals ending with 0.
 
 Benchmark mode: divides files into 10 equal blocks, samples N files per block (default N=10 for 100 total),
 runs DPLL in parallel, and prints per-file times plus summary.
+Memory is reported as growth of the process peak RSS; pass --memprofile to trace
+Python allocations with tracemalloc instead (slower, and the numbers differ).
+
+The solver works on a flat int array of literals with per-clause offsets and an
+array('b') assignment indexed by variable (1 true, -1 false, 0 unset). Assigning a
+literal updates per-clause counters through occurrence lists and pushes it on a
+trail; backtracking pops the trail and reverts the same counters, so no clause
+data is ever copied. Decisions pick the unassigned variable with the highest
+VSIDS activity and reuse the polarity it last had (phase saving).
+
+With --branch-workers N, a single search is shared by N processes: a worker
+whose branch stack reaches SPLIT_THRESHOLD hands its oldest open branch (as the
+list of literals leading to it) to an idle worker.
 """
 import os
+import re
 import sys
 import glob
 import random
 import time
 import argparse
 import tracemalloc
-from multiprocessing import Pool, cpu_count
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+from array import array
+from collections import deque
+from heapq import heapify, heappop, heappush
+from multiprocessing import Pool, Process, Queue, Value, cpu_count
+from queue import Empty
 
-def parse_dimacs_file(path):
+SPLIT_THRESHOLD = 2
+RESULT_POLL = 1.0
+VSIDS_DECAY = 0.95
+ACTIVITY_LIMIT = 1e100
+
+# tracemalloc slows allocation-heavy solving considerably, so it is only used
+# when asked for; otherwise memory is read from the process peak RSS.
+MEMPROFILE = resource is None
+# Linux lets a process reset its peak RSS (VmHWM), so a reused worker can
+# still measure each solve on its own.
+RSS_RESETTABLE = os.access('/proc/self/clear_refs', os.W_OK)
+
+# Parsed clauses are cached next to each .cnf file and reused while newer.
+CACHE_SUFFIX = '.cache'
+CACHE_MAGIC = 0x43464e43  # b'CNFC'
+CACHE_VERSION = 1
+
+HEADER_RE = re.compile(rb'(?m)^[ \t]*[cp%].*$')
+
+def save_clauses(cache, clauses):
+    # Layout: magic, version, clause count and literal count, then the clause
+    # offsets into the literal array and the literals themselves.
+    offsets = array('i', [0])
+    lits = array('i')
+    for c in clauses:
+        lits.extend(c)
+        offsets.append(len(lits))
+    tmp = f"{cache}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            array('i', [CACHE_MAGIC, CACHE_VERSION, len(clauses), len(lits)]).tofile(f)
+            offsets.tofile(f)
+            lits.tofile(f)
+        os.replace(tmp, cache)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def load_clauses(cache):
+    data = array('i')
+    with open(cache, 'rb') as f:
+        raw = f.read()
+    if len(raw) % data.itemsize:
+        raise ValueError(f"{cache}: not a clause cache")
+    data.frombytes(raw)
+    if len(data) < 4 or data[0] != CACHE_MAGIC or data[1] != CACHE_VERSION:
+        raise ValueError(f"{cache}: not a clause cache")
+    n, nlits = data[2], data[3]
+    if n < 0 or nlits < 0 or len(data) != 4 + n + 1 + nlits:
+        raise ValueError(f"{cache}: clause cache has the wrong size")
+    offsets, lits = data[4:n+5], data[n+5:]
+    if offsets[0] != 0 or offsets[n] != nlits or any(a > b for a, b in zip(offsets, offsets[1:])):
+        raise ValueError(f"{cache}: clause cache has bad offsets")
+    return [lits[offsets[i]:offsets[i+1]].tolist() for i in range(n)]
+
+def cache_is_fresh(path):
+    try:
+        return os.path.getmtime(path + CACHE_SUFFIX) >= os.path.getmtime(path)
+    except OSError:
+        return False
+
+def read_dimacs(path):
+    with open(path, 'rb') as f:
+        tokens = HEADER_RE.sub(b'', f.read()).split()
+    tokens.append(b'0')
     clauses = []
-    with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line or line[0] in ('c','%') or line.startswith('p'):
-                continue
-            lits = [int(x) for x in line.split() if x!='0']
-            if lits:
-                clauses.append(lits)
+    start = 0
+    while start < len(tokens):
+        end = tokens.index(b'0', start)
+        if end > start:
+            clauses.append(list(map(int, tokens[start:end])))
+        start = end + 1
+    return clauses
+
+def parse_dimacs_file(path):
+    # The cache holds the clauses exactly as written in the file, shared by
+    # all three solvers; any solver-specific normalisation happens after it.
+    cache = path + CACHE_SUFFIX
+    clauses = None
+    if cache_is_fresh(path):
+        try:
+            clauses = load_clauses(cache)
+        except ValueError:
+            pass
+    if clauses is None:
+        clauses = read_dimacs(path)
+        try:
+            save_clauses(cache, clauses)
+        except OSError:
+            pass
     return clauses
 
 def parse_dimacs_lines(lines):
@@ -42,93 +150,364 @@ def parse_dimacs_lines(lines):
             clauses.append(lits)
     return clauses
 
-def all_true(clauses, model):
-    return all(any(lit in model for lit in clause) for clause in clauses)
+def flatten(clauses):
+    lits = array('i')
+    offsets = array('i', [0])
+    for clause in clauses:
+        # clause_state counts literals, so repeated ones would hide units.
+        lits.extend(dict.fromkeys(clause))
+        offsets.append(len(lits))
+    return lits, offsets
 
-def some_false(clauses, model):
-    return any(all(-lit in model for lit in clause) for clause in clauses)
+class ClauseDB:
+    def __init__(self, clauses):
+        self.lits, self.offsets = flatten(clauses)
+        lits, offsets = self.lits, self.offsets
+        # lit_vars[k] is abs(lits[k]), so assignment lookups index directly.
+        self.lit_vars = array('i', map(abs, lits))
+        nvars = max(self.lit_vars, default=0)
+        n = len(offsets) - 1
+        self.assign = array('b', bytes(nvars+1))
+        self.pos_occ = [[] for _ in range(nvars+1)]
+        self.neg_occ = [[] for _ in range(nvars+1)]
+        for ci in range(n):
+            for k in range(offsets[ci], offsets[ci+1]):
+                lit = lits[k]
+                (self.pos_occ if lit > 0 else self.neg_occ)[abs(lit)].append(ci)
+        # clause_state counts the non-false literals of each clause and
+        # sat_level records the trail length at which a clause became true.
+        self.clause_state = array('i', (offsets[ci+1] - offsets[ci] for ci in range(n)))
+        self.sat_level = array('i', [0]) * n
+        # pos_count/neg_count count the unsatisfied clauses each literal
+        # occurs in; pending_pure holds variables that may have become pure.
+        self.pos_count = array('i', map(len, self.pos_occ))
+        self.neg_count = array('i', map(len, self.neg_occ))
+        self.pending_pure = [v for v in range(1, nvars+1) if self.is_pure(v)]
+        # pending_units holds clauses that may have become unit; assign_lit
+        # and undo queue every clause whose state they bring down or back to 1.
+        self.pending_units = [ci for ci in range(n) if self.clause_state[ci] == 1]
+        # VSIDS: activity starts at each variable's occurrence count and is
+        # bumped for the variables of every falsified clause. order_heap is a
+        # lazy max-heap of (-activity, var). heap_act holds the activity of a
+        # variable's live entry (-1 if it has none); any other entry for it is
+        # stale and skipped when popped.
+        self.activity = array('d', (len(p) + len(n) for p, n in zip(self.pos_occ, self.neg_occ)))
+        self.inc = 1.0
+        self.rebuild_heap()
+        self.phase = array('b', bytes(nvars+1))
+        self.conflict_clause = None
+        self.trail = []
+        self.nsat = 0
+        self.nfalse = 0
 
-def unit_clause(clauses, model):
-    for clause in clauses:
-        survivors = [lit for lit in clause if -lit not in model]
-        if len(survivors) == 1:
-            lit = survivors[0]
-            if lit not in model and -lit not in model:
-                return lit
-    return None
+    def occurrences(self, lit):
+        v = abs(lit)
+        if lit > 0:
+            return self.pos_occ[v], self.neg_occ[v]
+        return self.neg_occ[v], self.pos_occ[v]
 
-def pure_literal(clauses, model):
-    counts = {}
-    for clause in clauses:
-        for lit in clause:
-            if lit in model or -lit in model:
+    def is_pure(self, var):
+        return (self.pos_count[var] == 0) != (self.neg_count[var] == 0)
+
+    def count_clause(self, ci, delta):
+        lits, lit_vars = self.lits, self.lit_vars
+        pos_count, neg_count = self.pos_count, self.neg_count
+        for k in range(self.offsets[ci], self.offsets[ci+1]):
+            v = lit_vars[k]
+            if lits[k] > 0:
+                pos_count[v] += delta
+            else:
+                neg_count[v] += delta
+            if delta < 0 and self.is_pure(v):
+                self.pending_pure.append(v)
+
+    def assign_lit(self, lit):
+        self.trail.append(lit)
+        level = len(self.trail)
+        self.assign[abs(lit)] = 1 if lit > 0 else -1
+        sat_level, clause_state = self.sat_level, self.clause_state
+        true_occ, false_occ = self.occurrences(lit)
+        for ci in true_occ:
+            if not sat_level[ci]:
+                sat_level[ci] = level
+                self.nsat += 1
+                self.count_clause(ci, -1)
+        for ci in false_occ:
+            clause_state[ci] -= 1
+            if sat_level[ci]:
                 continue
-            counts.setdefault(abs(lit), set()).add(lit > 0)
-    for var, signs in counts.items():
-        if len(signs) == 1:
-            return var if True in signs else -var
+            if clause_state[ci] == 1:
+                self.pending_units.append(ci)
+            elif not clause_state[ci]:
+                self.nfalse += 1
+                self.conflict_clause = ci
+
+    def undo(self):
+        level = len(self.trail)
+        lit = self.trail.pop()
+        v = abs(lit)
+        self.assign[v] = 0
+        self.phase[v] = 1 if lit > 0 else -1
+        if self.heap_act[v] != self.activity[v]:
+            self.push_var(v)
+        sat_level, clause_state = self.sat_level, self.clause_state
+        true_occ, false_occ = self.occurrences(lit)
+        for ci in false_occ:
+            clause_state[ci] += 1
+            if not sat_level[ci] and clause_state[ci] == 1:
+                self.nfalse -= 1
+                self.pending_units.append(ci)
+        for ci in true_occ:
+            if sat_level[ci] == level:
+                sat_level[ci] = 0
+                self.nsat -= 1
+                self.count_clause(ci, 1)
+                if clause_state[ci] == 1:
+                    self.pending_units.append(ci)
+        if self.is_pure(v):
+            self.pending_pure.append(v)
+
+    def rebuild_heap(self):
+        activity, assign = self.activity, self.assign
+        self.heap_act = array('d', [-1.0]) * len(activity)
+        for v in range(1, len(activity)):
+            if assign[v] == 0:
+                self.heap_act[v] = activity[v]
+        self.order_heap = [(-self.heap_act[v], v) for v in range(1, len(activity))
+                           if self.heap_act[v] >= 0]
+        heapify(self.order_heap)
+
+    def push_var(self, v):
+        # Only called when v has no live entry or its activity changed since
+        # it was pushed; stale entries are purged once they dominate the heap.
+        self.heap_act[v] = self.activity[v]
+        heappush(self.order_heap, (-self.activity[v], v))
+        if len(self.order_heap) > 2*len(self.activity):
+            heap_act = self.heap_act
+            self.order_heap = [(-heap_act[u], u) for u in range(1, len(heap_act))
+                               if heap_act[u] >= 0]
+            heapify(self.order_heap)
+
+    def bump_conflict(self):
+        activity = self.activity
+        ci = self.conflict_clause
+        for k in range(self.offsets[ci], self.offsets[ci+1]):
+            activity[self.lit_vars[k]] += self.inc
+        self.inc /= VSIDS_DECAY
+        if self.inc > ACTIVITY_LIMIT:
+            for v in range(len(activity)):
+                activity[v] /= ACTIVITY_LIMIT
+            self.inc /= ACTIVITY_LIMIT
+            self.rebuild_heap()
+
+SAT, CONFLICT, UNDETERMINED = 1, -1, 0
+
+def status(db):
+    if db.nfalse:
+        return CONFLICT
+    if db.nsat == len(db.sat_level):
+        return SAT
+    return UNDETERMINED
+
+def unit_clause(db):
+    lits, lit_vars, offsets, assign = db.lits, db.lit_vars, db.offsets, db.assign
+    sat_level, clause_state, pending = db.sat_level, db.clause_state, db.pending_units
+    while pending:
+        ci = pending.pop()
+        if clause_state[ci] == 1 and not sat_level[ci]:
+            for k in range(offsets[ci], offsets[ci+1]):
+                if assign[lit_vars[k]] == 0:
+                    return lits[k]
     return None
 
-def simplify(clauses, var, value):
-    new = []
-    for clause in clauses:
-        if (var if value else -var) in clause:
+def pure_literal(db):
+    pending, assign = db.pending_pure, db.assign
+    while pending:
+        var = pending.pop()
+        if assign[var] == 0 and db.is_pure(var):
+            return var if db.pos_count[var] else -var
+    return None
+
+def branch_literal(db):
+    heap_act, assign = db.heap_act, db.assign
+    while db.order_heap:
+        act, var = heappop(db.order_heap)
+        if -act != heap_act[var]:
             continue
-        reduced = [lit for lit in clause if lit != (-var if value else var)]
-        new.append(reduced)
-    return new
-
-def dpll_rec(clauses, model):
-    if all_true(clauses, model):
-        return model
-    if some_false(clauses, model):
-        return None
-    unit = unit_clause(clauses, model)
-    if unit is not None:
-        return dpll_rec(simplify(clauses, abs(unit), unit>0), model | {unit})
-    pure = pure_literal(clauses, model)
-    if pure is not None:
-        return dpll_rec(simplify(clauses, abs(pure), pure>0), model | {pure})
-    for clause in clauses:
-        for lit in clause:
-            if lit not in model and -lit not in model:
-                var = abs(lit)
-                res = dpll_rec(simplify(clauses, var, True), model | {var})
-                if res is not None:
-                    return res
-                return dpll_rec(simplify(clauses, var, False), model | {-var})
+        heap_act[var] = -1.0
+        if assign[var] == 0:
+            return -var if db.phase[var] < 0 else var
     return None
 
-def run_with_metrics(clauses):
-    tracemalloc.start()
+def dpll_search(db, branches, split=None):
+    # branches holds the open (trail length, literal) alternatives, oldest
+    # first; split may hand the oldest ones to other workers.
+    while True:
+        state = status(db)
+        if state == SAT:
+            return db.assign
+        if state == CONFLICT:
+            db.bump_conflict()
+            if not branches:
+                return None
+            level, lit = branches.pop()
+            while len(db.trail) > level:
+                db.undo()
+            db.assign_lit(lit)
+            continue
+        lit = unit_clause(db)
+        if lit is None:
+            lit = pure_literal(db)
+        if lit is None:
+            lit = branch_literal(db)
+            branches.append((len(db.trail), -lit))
+            if split is not None:
+                split(db, branches)
+        db.assign_lit(lit)
+
+def branch_worker(wid, clauses, memprofile, tasks, results, idle):
+    global MEMPROFILE
+    MEMPROFILE = memprofile
+    rss_before = start_metrics()
+    db = ClauseDB(clauses)
+    results.put(('ready', None, wid, peak_so_far(rss_before)))
+
+    def split(db, branches):
+        if len(branches) < SPLIT_THRESHOLD or idle.value <= 0:
+            return
+        with idle.get_lock():
+            if idle.value <= 0:
+                return
+            idle.value -= 1
+        level, lit = branches.popleft()
+        results.put(('task', db.trail[:level] + [lit], wid, peak_so_far(rss_before)))
+
+    while True:
+        assumptions = tasks.get()
+        if assumptions is None:
+            return
+        while db.trail:
+            db.undo()
+        for lit in assumptions:
+            db.assign_lit(lit)
+        sat = dpll_search(db, deque(), split) is not None
+        with idle.get_lock():
+            idle.value += 1
+        results.put(('sat' if sat else 'unsat', None, wid, peak_so_far(rss_before)))
+
+def next_result(results, procs):
+    while True:
+        try:
+            return results.get(timeout=RESULT_POLL)
+        except Empty:
+            if not all(p.is_alive() for p in procs):
+                raise RuntimeError("a branch worker exited unexpectedly")
+
+def dpll_parallel(clauses, workers):
+    # Each worker measures its own memory; the reported figure is the sum of
+    # the peaks they last reported. Timing starts once every worker has built
+    # its ClauseDB, so process start-up is not counted.
+    tasks, results = Queue(), Queue()
+    idle = Value('i', workers - 1)
+    procs = [Process(target=branch_worker, args=(wid, clauses, MEMPROFILE, tasks, results, idle),
+                     daemon=True)
+             for wid in range(workers)]
+    for p in procs:
+        p.start()
+    peaks = [0.0] * workers
+    sat = False
+    try:
+        for _ in range(workers):
+            _, _, wid, peak = next_result(results, procs)
+            peaks[wid] = peak
+        start = time.time()
+        tasks.put([])
+        outstanding = 1
+        while outstanding:
+            kind, assumptions, wid, peak = next_result(results, procs)
+            peaks[wid] = max(peaks[wid], peak)
+            if kind == 'task':
+                tasks.put(assumptions)
+                outstanding += 1
+            elif kind == 'sat':
+                sat = True
+                break
+            else:
+                outstanding -= 1
+        elapsed = time.time() - start
+    finally:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            p.join()
+    return sat, elapsed, sum(peaks)
+
+def peak_rss():
+    if RSS_RESETTABLE:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+def start_metrics():
+    if MEMPROFILE:
+        tracemalloc.start()
+        return 0
+    if RSS_RESETTABLE:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    return peak_rss()
+
+def peak_so_far(rss_before):
+    if MEMPROFILE:
+        return tracemalloc.get_traced_memory()[1] / (1024*1024)
+    return (peak_rss() - rss_before) / (1024*1024)
+
+def stop_metrics(rss_before):
+    peak_mib = peak_so_far(rss_before)
+    if MEMPROFILE:
+        tracemalloc.stop()
+    return peak_mib
+
+def run_with_metrics(clauses, branch_workers=0):
+    if branch_workers:
+        return dpll_parallel(clauses, branch_workers)
+    rss_before = start_metrics()
     start = time.time()
-    result_model = dpll_rec(clauses, set())
+    satisfiable = dpll_search(ClauseDB(clauses), deque()) is not None
     elapsed = time.time() - start
-    _, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    peak_mib = peak / (1024*1024)
-    satisfiable = result_model is not None
+    peak_mib = stop_metrics(rss_before)
     return satisfiable, elapsed, peak_mib
 
-def interactive_mode():
+def interactive_mode(branch_workers=0):
     n = int(input("Enter number of clauses: "))
     print("Enter each clause:")
     lines = [input() for _ in range(n)]
     clauses = parse_dimacs_lines(lines)
     print("Solving...")
-    sat, t, mem = run_with_metrics(clauses)
+    sat, t, mem = run_with_metrics(clauses, branch_workers)
     print("Result:", "SATISFIABLE" if sat else "UNSATISFIABLE")
     print(f"Time elapsed: {t:.3f} seconds")
     print(f"Peak memory usage: {mem:.2f} MiB")
 
-def worker_dpll(path):
+def worker_dpll(path, branch_workers=0):
     clauses = parse_dimacs_file(path)
-    sat, elapsed, peak_mem = run_with_metrics(clauses)
+    sat, elapsed, peak_mem = run_with_metrics(clauses, branch_workers)
     name = os.path.basename(path)
     print(f"{name}: {'SAT' if sat else 'UNSAT'} in {elapsed:.3f}s, {peak_mem:.2f}MiB", flush=True)
     return elapsed, sat, peak_mem, name
 
-def benchmark_mode(folder, sample_per_block, workers):
+def init_worker(memprofile):
+    global MEMPROFILE
+    MEMPROFILE = memprofile
+    if not memprofile and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    random.seed()
+
+def benchmark_mode(folder, sample_per_block, workers, branch_workers=0):
     files = sorted(glob.glob(os.path.join(folder, "*.cnf")))
     if not files:
         print(f"No .cnf files in {folder}")
@@ -140,19 +519,35 @@ def benchmark_mode(folder, sample_per_block, workers):
         blk = files[i*block_size:(i+1)*block_size] if i<9 else files[i*block_size:]
         picks = blk if len(blk)<=sample_per_block else random.sample(blk, sample_per_block)
         samples.extend(picks)
-    print(f"Sampling {len(samples)} of {total} files with {workers or cpu_count()} workers...\n")
-    results = []
-    pool = Pool(processes=workers or cpu_count())
-    try:
-        for res in pool.imap_unordered(worker_dpll, samples):
-            results.append(res)
-    except KeyboardInterrupt:
-        pool.terminate()
-        pool.join()
-        sys.exit(1)
+    # Parse the DIMACS text once in the parent; workers then only load the
+    # packed clause cache.
+    for path in samples:
+        if not cache_is_fresh(path):
+            parse_dimacs_file(path)
+    if branch_workers:
+        print(f"Sampling {len(samples)} of {total} files, {branch_workers} branch workers per file...\n")
+        results = [worker_dpll(path, branch_workers) for path in samples]
     else:
-        pool.close()
-        pool.join()
+        print(f"Sampling {len(samples)} of {total} files with {workers or cpu_count()} workers...\n")
+        results = []
+        nproc = workers or cpu_count()
+        # Workers are reused and fed batches unless RSS figures need a fresh
+        # process per file because the peak cannot be reset between solves.
+        reuse = MEMPROFILE or RSS_RESETTABLE
+        maxtasks = None if reuse else 1
+        chunksize = max(1, len(samples) // (nproc*4)) if reuse else 1
+        pool = Pool(processes=nproc, initializer=init_worker, initargs=(MEMPROFILE,),
+                    maxtasksperchild=maxtasks)
+        try:
+            for res in pool.imap_unordered(worker_dpll, samples, chunksize=chunksize):
+                results.append(res)
+        except KeyboardInterrupt:
+            pool.terminate()
+            pool.join()
+            sys.exit(1)
+        else:
+            pool.close()
+            pool.join()
 
     times = [e for e, _, _, _ in results]
     mems  = [m for _, _, m, _ in results]
@@ -175,18 +570,30 @@ def benchmark_mode(folder, sample_per_block, workers):
     print(f"Slowest solve time     : {max(times):.3f}s ({results[slowest_idx][3]})")
     print(f"Lowest memory usage    : {min(mems):.2f} MiB ({results[leanest_idx][3]})")
     print(f"Highest memory usage   : {max(mems):.2f} MiB ({results[heaviest_idx][3]})")
+    if MEMPROFILE:
+        print("Memory figures are tracemalloc peaks of Python allocations.")
+    else:
+        print("Memory figures are peak RSS growth during each solve"
+              + ("" if RSS_RESETTABLE else ", one worker process per file")
+              + " (use --memprofile for tracemalloc).")
+    if branch_workers:
+        print("Memory figures are summed over each file's branch workers; times exclude worker start-up.")
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('cnf_dir', nargs='?')
     parser.add_argument('--sample-per-block', type=int, default=10)
     parser.add_argument('--workers', type=int, default=0)
+    parser.add_argument('--memprofile', action='store_true')
+    parser.add_argument('--branch-workers', type=int, default=0)
     args = parser.parse_args()
+    global MEMPROFILE
+    MEMPROFILE = MEMPROFILE or args.memprofile
     random.seed()
     if args.cnf_dir and os.path.isdir(args.cnf_dir):
-        benchmark_mode(args.cnf_dir, args.sample_per_block, args.workers)
+        benchmark_mode(args.cnf_dir, args.sample_per_block, args.workers, args.branch_workers)
     else:
-        interactive_mode()
+        interactive_mode(args.branch_workers)
 
 if __name__ == "__main__":
     main()
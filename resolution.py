@@ -12,26 +12,119 @@ Interactive mode: prompts for number of clauses, then each clause as integer lit
 
 Benchmark mode: divides files into 10 equal blocks, samples N files per block (default N=10 for 100 total),
 runs resolution in parallel, and prints per-file times plus summary.
+Memory is reported as growth of the process peak RSS; pass --memprofile to trace
+Python allocations with tracemalloc instead (slower, and the numbers differ).
+
+Each clause is a single Python int: bit v for literal v and bit width+v for -v,
+with width fixed per instance. Resolving, subsumption and tautology checks are a
+handful of shifts and AND/OR operations on those ints. Derived
+clauses that are subsumed by a known clause are dropped, and known clauses
+subsumed by a newly added one are removed.
 """
 import os
+import re
 import sys
 import glob
 import random
 import time
 import argparse
 import tracemalloc
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+from array import array
 from multiprocessing import Pool, cpu_count
 
-def parse_dimacs_file(path):
+# tracemalloc slows allocation-heavy solving considerably, so it is only used
+# when asked for; otherwise memory is read from the process peak RSS.
+MEMPROFILE = resource is None
+# Linux lets a process reset its peak RSS (VmHWM), so a reused worker can
+# still measure each solve on its own.
+RSS_RESETTABLE = os.access('/proc/self/clear_refs', os.W_OK)
+
+# Parsed clauses are cached next to each .cnf file and reused while newer.
+CACHE_SUFFIX = '.cache'
+CACHE_MAGIC = 0x43464e43  # b'CNFC'
+CACHE_VERSION = 1
+
+HEADER_RE = re.compile(rb'(?m)^[ \t]*[cp%].*$')
+
+def save_clauses(cache, clauses):
+    # Layout: magic, version, clause count and literal count, then the clause
+    # offsets into the literal array and the literals themselves.
+    offsets = array('i', [0])
+    lits = array('i')
+    for c in clauses:
+        lits.extend(c)
+        offsets.append(len(lits))
+    tmp = f"{cache}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            array('i', [CACHE_MAGIC, CACHE_VERSION, len(clauses), len(lits)]).tofile(f)
+            offsets.tofile(f)
+            lits.tofile(f)
+        os.replace(tmp, cache)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def load_clauses(cache):
+    data = array('i')
+    with open(cache, 'rb') as f:
+        raw = f.read()
+    if len(raw) % data.itemsize:
+        raise ValueError(f"{cache}: not a clause cache")
+    data.frombytes(raw)
+    if len(data) < 4 or data[0] != CACHE_MAGIC or data[1] != CACHE_VERSION:
+        raise ValueError(f"{cache}: not a clause cache")
+    n, nlits = data[2], data[3]
+    if n < 0 or nlits < 0 or len(data) != 4 + n + 1 + nlits:
+        raise ValueError(f"{cache}: clause cache has the wrong size")
+    offsets, lits = data[4:n+5], data[n+5:]
+    if offsets[0] != 0 or offsets[n] != nlits or any(a > b for a, b in zip(offsets, offsets[1:])):
+        raise ValueError(f"{cache}: clause cache has bad offsets")
+    return [lits[offsets[i]:offsets[i+1]].tolist() for i in range(n)]
+
+def cache_is_fresh(path):
+    try:
+        return os.path.getmtime(path + CACHE_SUFFIX) >= os.path.getmtime(path)
+    except OSError:
+        return False
+
+def read_dimacs(path):
+    with open(path, 'rb') as f:
+        tokens = HEADER_RE.sub(b'', f.read()).split()
+    tokens.append(b'0')
     clauses = []
-    with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line or line[0] in ('c','%') or line.startswith('p'):
-                continue
-            lits = [int(x) for x in line.split() if x!='0']
-            if lits:
-                clauses.append(set(lits))
+    start = 0
+    while start < len(tokens):
+        end = tokens.index(b'0', start)
+        if end > start:
+            clauses.append(list(map(int, tokens[start:end])))
+        start = end + 1
+    return clauses
+
+def parse_dimacs_file(path):
+    # The cache holds the clauses exactly as written in the file, shared by
+    # all three solvers. Duplicate literals need no cleanup here: resolution()
+    # turns each clause into a bitmask straight away.
+    cache = path + CACHE_SUFFIX
+    clauses = None
+    if cache_is_fresh(path):
+        try:
+            clauses = load_clauses(cache)
+        except ValueError:
+            pass
+    if clauses is None:
+        clauses = read_dimacs(path)
+        try:
+            save_clauses(cache, clauses)
+        except OSError:
+            pass
     return clauses
 
 def parse_dimacs_lines(lines):
@@ -39,41 +132,118 @@ def parse_dimacs_lines(lines):
     for line in lines:
         lits = [int(x) for x in line.strip().split() if x!='0']
         if lits:
-            clauses.append(set(lits))
+            clauses.append(lits)
     return clauses
 
-def resolve_pair(c1, c2):
-    for lit in c1:
-        if -lit in c2:
-            resolvent = (c1 | c2) - {lit, -lit}
-            return resolvent
-    return None
+def to_clause(lits, width):
+    c = 0
+    for lit in lits:
+        c |= 1 << (lit if lit > 0 else width - lit)
+    return c
+
+def resolve_pair(c1, c2, width):
+    # c2 >> width holds c2's negative literals in the positive bit range.
+    clash = (c1 & (c2 >> width)) | (c2 & (c1 >> width))
+    # Clashing on more than one variable only yields tautologies.
+    if not clash or clash & (clash - 1):
+        return None
+    return (c1 | c2) & ~(clash | clash << width)
+
+def literals(c, width):
+    while c:
+        low = c & -c
+        bit = low.bit_length() - 1
+        yield bit if bit < width else width - bit
+        c ^= low
+
+def clause_len(c):
+    return bin(c).count('1')
+
+def subsumes(c1, c2):
+    return not c1 & ~c2
+
+def is_subsumed(occ, c, width):
+    # Any clause subsuming c shares at least one literal with it.
+    return any(subsumes(d, c) for lit in literals(c, width) for d in occ.get(lit, ()))
+
+def add_clause(clauses, occ, c, width):
+    if is_subsumed(occ, c, width):
+        return False
+    lits = list(literals(c, width))
+    # Clauses subsumed by c contain all its literals, so the rarest one is
+    # enough to find them.
+    rare = min(lits, key=lambda lit: len(occ.get(lit, ())))
+    for d in [d for d in occ.get(rare, ()) if subsumes(c, d)]:
+        clauses.discard(d)
+        for lit in literals(d, width):
+            occ[lit].discard(d)
+    clauses.add(c)
+    for lit in lits:
+        occ.setdefault(lit, set()).add(c)
+    return True
 
 def resolution(clauses):
-    clauses = set(frozenset(c) for c in clauses)
-    new = set()
-    while True:
-        pairs = list(clauses)
-        for i in range(len(pairs)):
-            for j in range(i+1, len(pairs)):
-                r = resolve_pair(pairs[i], pairs[j])
-                if r is not None:
-                    if not r:  # empty clause
-                        return False
-                    new.add(frozenset(r))
-        if new.issubset(clauses):
-            return True
-        clauses |= new
-        new.clear()
+    # Bit v of a clause stands for literal v and bit width+v for -v, so each
+    # clause is a single int sized to this instance.
+    width = max((abs(lit) for c in clauses for lit in c), default=0) + 1
+    initial = set(to_clause(c, width) for c in clauses)
+    clauses = set()
+    occ = {}
+    for c in sorted(initial, key=clause_len):
+        if not c & (c >> width):
+            add_clause(clauses, occ, c, width)
+    # Given-clause saturation: only pairs with at least one clause added in
+    # the previous round can produce anything new, and the occurrence index
+    # yields exactly the clauses clashing with a given literal.
+    frontier = list(clauses)
+    while frontier:
+        new = set()
+        for c in frontier:
+            if c not in clauses:
+                continue
+            for lit in literals(c, width):
+                for d in occ.get(-lit, ()):
+                    r = resolve_pair(c, d, width)
+                    if r is not None:
+                        if not r:  # empty clause
+                            return False
+                        if r not in clauses and not is_subsumed(occ, r, width):
+                            new.add(r)
+        frontier = [r for r in sorted(new, key=clause_len) if add_clause(clauses, occ, r, width)]
+    return True
+
+def peak_rss():
+    if RSS_RESETTABLE:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+def start_metrics():
+    if MEMPROFILE:
+        tracemalloc.start()
+        return 0
+    if RSS_RESETTABLE:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    return peak_rss()
+
+def stop_metrics(rss_before):
+    if MEMPROFILE:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak / (1024*1024)
+    return (peak_rss() - rss_before) / (1024*1024)
 
 def run_with_metrics(clauses):
-    tracemalloc.start()
+    rss_before = start_metrics()
     start = time.time()
     sat = resolution(clauses)
     elapsed = time.time() - start
-    _, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return sat, elapsed, peak / (1024*1024)
+    return sat, elapsed, stop_metrics(rss_before)
 
 def interactive_mode():
     n = int(input("Enter number of clauses: "))
@@ -93,6 +263,13 @@ def worker_res(path):
     print(f"{name}: {'SAT' if sat else 'UNSAT'} in {elapsed:.3f}s, {peak_mem:.2f}MiB", flush=True)
     return elapsed, sat, peak_mem, name
 
+def init_worker(memprofile):
+    global MEMPROFILE
+    MEMPROFILE = memprofile
+    if not memprofile and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    random.seed()
+
 def benchmark_mode(folder, sample_per_block, workers):
     files = sorted(glob.glob(os.path.join(folder, "*.cnf")))
     if not files:
@@ -105,11 +282,23 @@ def benchmark_mode(folder, sample_per_block, workers):
         blk = files[i*block_size:(i+1)*block_size] if i<9 else files[i*block_size:]
         picks = blk if len(blk)<=sample_per_block else random.sample(blk, sample_per_block)
         samples.extend(picks)
+    # Parse the DIMACS text once in the parent; workers then only load the
+    # packed clause cache.
+    for path in samples:
+        if not cache_is_fresh(path):
+            parse_dimacs_file(path)
     print(f"Sampling {len(samples)} of {total} files with {workers or cpu_count()} workers...\n")
     results = []
-    pool = Pool(processes=workers or cpu_count())
+    nproc = workers or cpu_count()
+    # Workers are reused and fed batches unless RSS figures need a fresh
+    # process per file because the peak cannot be reset between solves.
+    reuse = MEMPROFILE or RSS_RESETTABLE
+    maxtasks = None if reuse else 1
+    chunksize = max(1, len(samples) // (nproc*4)) if reuse else 1
+    pool = Pool(processes=nproc, initializer=init_worker, initargs=(MEMPROFILE,),
+                maxtasksperchild=maxtasks)
     try:
-        for res in pool.imap_unordered(worker_res, samples):
+        for res in pool.imap_unordered(worker_res, samples, chunksize=chunksize):
             results.append(res)
     except KeyboardInterrupt:
         print("\nReceived interrupt — terminating workers…", file=sys.stderr)
@@ -141,13 +330,22 @@ def benchmark_mode(folder, sample_per_block, workers):
     print(f"Slowest solve time     : {max(times):.3f}s ({results[slowest_idx][3]})")
     print(f"Lowest memory usage    : {min(mems):.2f} MiB ({results[leanest_idx][3]})")
     print(f"Highest memory usage   : {max(mems):.2f} MiB ({results[heaviest_idx][3]})")
+    if MEMPROFILE:
+        print("Memory figures are tracemalloc peaks of Python allocations.")
+    else:
+        print("Memory figures are peak RSS growth during each solve"
+              + ("" if RSS_RESETTABLE else ", one worker process per file")
+              + " (use --memprofile for tracemalloc).")
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('cnf_dir', nargs='?')
     parser.add_argument('--sample-per-block', type=int, default=10)
     parser.add_argument('--workers', type=int, default=0)
+    parser.add_argument('--memprofile', action='store_true')
     args = parser.parse_args()
+    global MEMPROFILE
+    MEMPROFILE = MEMPROFILE or args.memprofile
     random.seed()
     if args.cnf_dir and os.path.isdir(args.cnf_dir):
         benchmark_mode(args.cnf_dir, args.sample_per_block, args.workers)